@@ -13,24 +13,48 @@ This script generates all the charts documented in ANALYSIS_REPORT.md
 import pandas as pd
 import geopandas as gpd
 import matplotlib.pyplot as plt
-import seaborn as sns
+from cycler import cycler
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set up plotting style
-plt.style.use('default')
-sns.set_palette("Set2")
-plt.rcParams['figure.figsize'] = (15, 10)
-plt.rcParams['font.size'] = 10
+# pyogrio reads shapefiles in bulk through GDAL (and into Arrow when pyarrow is
+# present) instead of feature by feature; fall back to the default engine without it
+try:
+    import pyogrio  # noqa: F401
+    PYOGRIO_AVAILABLE = True
+except ImportError:
+    PYOGRIO_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def configure_plot_style():
+    """Apply the report's plotting style (matplotlib default with the Set2 palette)."""
+    plt.style.use('default')
+    # Same colours as seaborn's "Set2" palette, without importing seaborn/scipy
+    plt.rcParams['axes.prop_cycle'] = cycler(color=plt.get_cmap('Set2').colors)
+    plt.rcParams['figure.figsize'] = (15, 10)
+    plt.rcParams['font.size'] = 10
+    # Lay figures out during the save draw instead of a separate tight_layout pass
+    plt.rcParams['figure.constrained_layout.use'] = True
 
 class NorwegianHydropowerAnalyzer:
     """
     Advanced analyzer for Norwegian hydropower data with enhanced visualizations.
     """
+
+    # Attribute columns the analyses actually use; geometry is always read
+    DAM_COLUMNS = ['idriftAar']
+    RESERVOIR_COLUMNS = ['magNavn', 'areal_km2', 'volOppdemt']
     
     def __init__(self, data_dir="Data"):
         self.data_dir = Path(data_dir)
@@ -42,6 +66,9 @@ class NorwegianHydropowerAnalyzer:
         # Archive directory for old images
         self.archive_dir = Path("old_visualizations")
         self.archive_dir.mkdir(exist_ok=True)
+
+        # WGS84 copies of the layers, reprojected on first use
+        self._wgs84 = {}
         
         # Load data
         self.load_all_data()
@@ -95,10 +122,15 @@ class NorwegianHydropowerAnalyzer:
         print("🔄 Loading Norwegian hydropower data...")
         
         try:
-            # Load spatial data
-            self.dam_linje_gdf = gpd.read_file(self.data_dir / "Vannkraft_DamLinje.shp")
-            self.dam_punkt_gdf = gpd.read_file(self.data_dir / "Vannkraft_DamPunkt.shp")
-            self.magasin_gdf = gpd.read_file(self.data_dir / "Vannkraft_Magasin.shp")
+            # Load spatial data; the three layers are independent and GDAL
+            # releases the GIL while reading, so overlap them on a small pool
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                dam_linje = pool.submit(self._read_layer, "Vannkraft_DamLinje.shp", self.DAM_COLUMNS)
+                dam_punkt = pool.submit(self._read_layer, "Vannkraft_DamPunkt.shp", self.DAM_COLUMNS)
+                magasin = pool.submit(self._read_layer, "Vannkraft_Magasin.shp", self.RESERVOIR_COLUMNS)
+                self.dam_linje_gdf = dam_linje.result()
+                self.dam_punkt_gdf = dam_punkt.result()
+                self.magasin_gdf = magasin.result()
             
             print(f"✅ Loaded {len(self.dam_linje_gdf)} dam lines")
             print(f"✅ Loaded {len(self.dam_punkt_gdf)} dam points")  
@@ -110,95 +142,102 @@ class NorwegianHydropowerAnalyzer:
         
         return True
     
+    def _read_layer(self, filename, columns):
+        """Read one shapefile, decoding only the given attribute columns when pyogrio is available."""
+        path = self.data_dir / filename
+        if not PYOGRIO_AVAILABLE:
+            return gpd.read_file(path)
+        return gpd.read_file(path, engine='pyogrio', columns=columns, use_arrow=PYARROW_AVAILABLE)
+
+    def _to_wgs84(self, name):
+        """Return the named layer in EPSG:4326, reprojecting it at most once."""
+        if name not in self._wgs84:
+            gdf = getattr(self, f"{name}_gdf")
+            if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+                gdf = gdf.to_crs(epsg=4326)
+            self._wgs84[name] = gdf
+        return self._wgs84[name]
+    
     def create_enhanced_reservoir_analysis(self):
         """Create reservoir analyses as separate, well-labeled figures."""
         print("\n📊 Creating reservoir analyses (separate figures)...")
 
-        # Clean data - remove zero and extreme outliers
-        reservoir_data = self.magasin_gdf.copy()
+        # Clean data - remove zero and extreme outliers. Only read from here
+        # on (boolean masks and nlargest return new frames), so no copy
+        reservoir_data = self.magasin_gdf
+        area = reservoir_data['areal_km2']
+        volume = reservoir_data['volOppdemt']
+        area_positive = area > 0
+        volume_positive = volume > 0
 
-        # Filter out unrealistic values
-        area_data = reservoir_data[
-            (reservoir_data['areal_km2'] > 0) &
-            (reservoir_data['areal_km2'] < 200)
-        ]['areal_km2']
+        # Filter out unrealistic values (NaN fails every comparison, so the
+        # masks already exclude missing values)
+        area_data = area[area_positive & (area < 200)]
 
-        volume_data = reservoir_data[
-            (reservoir_data['volOppdemt'] > 0) &
-            (reservoir_data['volOppdemt'] < 1000)
-        ]['volOppdemt'].dropna()
+        volume_data = volume[volume_positive & (volume < 1000)]
+
+        # Bin once with numpy; the linear and log area plots share the same counts
+        area_counts, area_edges = np.histogram(area_data.to_numpy(dtype=np.float64), bins=50)
+        volume_counts, volume_edges = np.histogram(volume_data.to_numpy(dtype=np.float64), bins=40)
 
         # 1) Reservoir Areas Distribution
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.hist(area_data, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+        ax.hist(area_edges[:-1], bins=area_edges, weights=area_counts, alpha=0.7, color='skyblue', edgecolor='black')
         ax.set_title('Reservoir Areas Distribution (Excluding Extreme Outliers)', fontweight='bold')
         ax.set_xlabel('Area (km²)')
         ax.set_ylabel('Number of Reservoirs')
         ax.grid(True, alpha=0.3)
-        mean_area = area_data.mean()
-        median_area = area_data.median()
+        mean_area, median_area = area_data.agg(['mean', 'median'])
         ax.axvline(mean_area, color='red', linestyle='--', label=f'Mean: {mean_area:.2f} km²')
         ax.axvline(median_area, color='orange', linestyle='--', label=f'Median: {median_area:.2f} km²')
         ax.legend()
-        plt.tight_layout()
         plt.savefig(self.results_dir / "reservoir_areas_distribution.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 2) Reservoir Areas (Log Y)
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.hist(area_data, bins=50, alpha=0.7, color='lightgreen', edgecolor='black')
+        ax.hist(area_edges[:-1], bins=area_edges, weights=area_counts, alpha=0.7, color='lightgreen', edgecolor='black')
         ax.set_yscale('log')
         ax.set_title('Reservoir Areas (Log Scale)', fontweight='bold')
         ax.set_xlabel('Area (km²)')
         ax.set_ylabel('Number of Reservoirs (log)')
         ax.grid(True, alpha=0.3)
-        plt.tight_layout()
         plt.savefig(self.results_dir / "reservoir_areas_log.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 3) Reservoir Volumes Distribution
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.hist(volume_data, bins=40, alpha=0.7, color='lightcoral', edgecolor='black')
+        ax.hist(volume_edges[:-1], bins=volume_edges, weights=volume_counts, alpha=0.7, color='lightcoral', edgecolor='black')
         ax.set_title('Reservoir Volumes Distribution (Excluding Extreme Outliers)', fontweight='bold')
         ax.set_xlabel('Volume (million m³)')
         ax.set_ylabel('Number of Reservoirs')
         ax.grid(True, alpha=0.3)
-        mean_vol = volume_data.mean()
-        median_vol = volume_data.median()
+        mean_vol, median_vol = volume_data.agg(['mean', 'median'])
         ax.axvline(mean_vol, color='red', linestyle='--', label=f'Mean: {mean_vol:.1f} million m³')
         ax.axvline(median_vol, color='orange', linestyle='--', label=f'Median: {median_vol:.1f} million m³')
         ax.legend()
-        plt.tight_layout()
         plt.savefig(self.results_dir / "reservoir_volumes_distribution.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 4) Size Categories Pie
-        def categorize_reservoir_size(area: float) -> str:
-            if area < 0.5:
-                return 'Small (<0.5 km²)'
-            if area < 5:
-                return 'Medium (0.5-5 km²)'
-            if area < 20:
-                return 'Large (5-20 km²)'
-            return 'Very Large (>20 km²)'
-
-        size_categories = area_data.apply(categorize_reservoir_size)
+        size_categories = pd.cut(
+            area_data,
+            bins=[-np.inf, 0.5, 5, 20, np.inf],
+            labels=['Small (<0.5 km²)', 'Medium (0.5-5 km²)', 'Large (5-20 km²)', 'Very Large (>20 km²)'],
+            right=False,
+        )
         size_counts = size_categories.value_counts()
+        size_counts = size_counts[size_counts > 0]
         fig, ax = plt.subplots(figsize=(8, 8))
         colors = ['lightblue', 'lightgreen', 'orange', 'red']
         ax.pie(size_counts.values, labels=size_counts.index, autopct='%1.1f%%', colors=colors, startangle=90)
         ax.set_title('Reservoir Size Categories (By Area)', fontweight='bold')
-        plt.tight_layout()
         plt.savefig(self.results_dir / "reservoir_size_categories.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 5) Volume vs Area Scatter
-        area_vol_data = reservoir_data[
-            (reservoir_data['areal_km2'] > 0) &
-            (reservoir_data['areal_km2'] < 100) &
-            (reservoir_data['volOppdemt'] > 0) &
-            (reservoir_data['volOppdemt'] < 500)
-        ].dropna(subset=['areal_km2', 'volOppdemt'])
+        area_vol_mask = area_positive & (area < 100) & volume_positive & (volume < 500)
+        area_vol_data = reservoir_data.loc[area_vol_mask, ['areal_km2', 'volOppdemt']]
 
         if len(area_vol_data) > 0:
             fig, ax = plt.subplots(figsize=(10, 6))
@@ -220,12 +259,17 @@ class NorwegianHydropowerAnalyzer:
             correlation = area_vol_data['areal_km2'].corr(area_vol_data['volOppdemt'])
             ax.text(0.02, 0.98, f'Correlation: {correlation:.3f}', transform=ax.transAxes,
                     va='top', bbox=dict(boxstyle='round', facecolor='wheat'))
-            plt.tight_layout()
             plt.savefig(self.results_dir / "reservoir_area_vs_volume.png", dpi=300, bbox_inches='tight')
             plt.close(fig)
 
         # 6) Top 10 Largest Reservoirs
-        top_reservoirs = reservoir_data.nlargest(10, 'areal_km2')[['magNavn', 'areal_km2']].dropna()
+        # argpartition finds the 10 largest in linear time; only those 10 get sorted
+        area_values = area.to_numpy(dtype=np.float64)
+        candidates = np.flatnonzero(~np.isnan(area_values))
+        k = min(10, len(candidates))
+        top_idx = candidates[np.argpartition(area_values[candidates], -k)[-k:]] if k else candidates
+        top_idx = top_idx[np.argsort(-area_values[top_idx], kind='stable')]
+        top_reservoirs = reservoir_data.iloc[top_idx][['magNavn', 'areal_km2']].dropna()
         if len(top_reservoirs) > 0:
             fig, ax = plt.subplots(figsize=(10, 6))
             bars = ax.barh(range(len(top_reservoirs)), top_reservoirs['areal_km2'], color='steelblue', alpha=0.8)
@@ -237,7 +281,6 @@ class NorwegianHydropowerAnalyzer:
             for bar in bars:
                 width = bar.get_width()
                 ax.text(width + 0.5, bar.get_y() + bar.get_height()/2, f'{width:.1f}', ha='left', va='center', fontsize=9)
-            plt.tight_layout()
             plt.savefig(self.results_dir / "top10_reservoirs_by_area.png", dpi=300, bbox_inches='tight')
             plt.close(fig)
     
@@ -267,7 +310,6 @@ class NorwegianHydropowerAnalyzer:
             height = bar.get_height()
             if height > 0:
                 ax.text(bar.get_x() + bar.get_width()/2., height + 2, f'{int(height)}', ha='center', va='bottom', fontsize=9)
-        plt.tight_layout()
         plt.savefig(self.results_dir / "construction_by_decade.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
@@ -291,7 +333,6 @@ class NorwegianHydropowerAnalyzer:
                 color='red',
                 fontweight='bold',
             )
-        plt.tight_layout()
         plt.savefig(self.results_dir / "cumulative_construction.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
@@ -319,7 +360,6 @@ class NorwegianHydropowerAnalyzer:
                 fontsize=10, color='red', fontweight='bold',
                 bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.6),
             )
-        plt.tight_layout()
         plt.savefig(self.results_dir / "construction_rate_5yr.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
@@ -345,7 +385,6 @@ class NorwegianHydropowerAnalyzer:
         for bar in bars:
             height = bar.get_height()
             ax.text(bar.get_x() + bar.get_width()/2., height + 5, f'{int(height)}', ha='center', va='bottom', fontsize=10, fontweight='bold')
-        plt.tight_layout()
         plt.savefig(self.results_dir / "construction_by_historical_period.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
     
@@ -354,13 +393,17 @@ class NorwegianHydropowerAnalyzer:
         print("\n🗺️  Creating spatial visualizations (separate figures)...")
 
         # Convert to WGS84 for better visualization
-        dam_linje_wgs84 = self.dam_linje_gdf.to_crs('EPSG:4326')
-        dam_punkt_wgs84 = self.dam_punkt_gdf.to_crs('EPSG:4326')
-        magasin_wgs84 = self.magasin_gdf.to_crs('EPSG:4326')
+        dam_linje_wgs84 = self._to_wgs84('dam_linje')
+        dam_punkt_wgs84 = self._to_wgs84('dam_punkt')
+        magasin_wgs84 = self._to_wgs84('magasin')
+
+        # The reservoirs are only a faint backdrop on three of the maps; simplify
+        # them once to well under a pixel at 300 dpi instead of drawing every vertex
+        magasin_background = magasin_wgs84.geometry.simplify(0.001)
 
         # 1) Dam Lines with reservoirs background
         fig, ax = plt.subplots(figsize=(12, 8))
-        magasin_wgs84.plot(ax=ax, color='lightblue', alpha=0.3, edgecolor='none')
+        magasin_background.plot(ax=ax, color='lightblue', alpha=0.3, edgecolor='none', rasterized=True)
         dam_linje_wgs84.plot(ax=ax, color='red', linewidth=1.2, alpha=0.85)
         ax.set_title('Norwegian Dam Lines (Enhanced Visibility)', fontweight='bold')
         ax.set_xlabel('Longitude')
@@ -368,20 +411,22 @@ class NorwegianHydropowerAnalyzer:
         ax.grid(True, alpha=0.3)
         ax.text(0.02, 0.98, f'Total Dam Lines: {len(dam_linje_wgs84)}', transform=ax.transAxes,
                 bbox=dict(boxstyle='round', facecolor='white'), va='top', fontsize=10, fontweight='bold')
-        plt.tight_layout()
         plt.savefig(self.results_dir / "spatial_dam_lines.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 2) Dam Points sized/colored by year
         current_year = 2024
-        dam_punkt_clean = dam_punkt_wgs84.dropna(subset=['idriftAar'])
-        dam_punkt_clean = dam_punkt_clean[dam_punkt_clean['idriftAar'] > 1800]
-        ages = current_year - dam_punkt_clean['idriftAar']
-        sizes = 100 - (ages / ages.max()) * 80  # 20-100
+        years = dam_punkt_wgs84['idriftAar'].to_numpy(dtype=np.float64)
+        known = years > 1800  # NaN compares False, so this also drops missing years
+        dam_punkt_clean = dam_punkt_wgs84[known]
+        years = years[known]
+        ages = current_year - years
+        sizes = 100 - (ages / ages.max(initial=1.0)) * 80  # 20-100
         fig, ax = plt.subplots(figsize=(12, 8))
-        magasin_wgs84.plot(ax=ax, color='lightblue', alpha=0.2, edgecolor='none')
-        sc = ax.scatter(dam_punkt_clean.geometry.x, dam_punkt_clean.geometry.y,
-                        c=dam_punkt_clean['idriftAar'], s=sizes, alpha=0.7,
+        magasin_background.plot(ax=ax, color='lightblue', alpha=0.2, edgecolor='none', rasterized=True)
+        dam_xy = dam_punkt_clean.geometry.get_coordinates().to_numpy()
+        sc = ax.scatter(dam_xy[:, 0], dam_xy[:, 1],
+                        c=years, s=sizes, alpha=0.7,
                         cmap='plasma', edgecolors='black', linewidth=0.3)
         ax.set_title('Dam Points (Size by Era, Color by Year)', fontweight='bold')
         ax.set_xlabel('Longitude')
@@ -389,22 +434,15 @@ class NorwegianHydropowerAnalyzer:
         ax.grid(True, alpha=0.3)
         cbar = plt.colorbar(sc, ax=ax)
         cbar.set_label('Construction Year', fontsize=10)
-        plt.tight_layout()
         plt.savefig(self.results_dir / "spatial_dam_points_by_year.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 3) Reservoir size categories map
-        def get_reservoir_color(area: float) -> str:
-            if area < 0.5:
-                return 'lightblue'
-            if area < 5:
-                return 'blue'
-            if area < 20:
-                return 'darkblue'
-            return 'navy'
+        size_thresholds = np.array([0.5, 5, 20])
+        size_colors = np.array(['lightblue', 'blue', 'darkblue', 'navy'])
 
         magasin_clean = magasin_wgs84[magasin_wgs84['areal_km2'] > 0]
-        colors = magasin_clean['areal_km2'].apply(get_reservoir_color)
+        colors = size_colors[np.searchsorted(size_thresholds, magasin_clean['areal_km2'].to_numpy(), side='right')]
         fig, ax = plt.subplots(figsize=(12, 8))
         magasin_clean.plot(ax=ax, color=colors, alpha=0.75, edgecolor='white', linewidth=0.5)
         ax.set_title('Reservoir Size Categories (Color-Coded by Area)', fontweight='bold')
@@ -418,13 +456,12 @@ class NorwegianHydropowerAnalyzer:
             plt.Rectangle((0,0),1,1, facecolor='navy', label='Very Large (>20 km²)')
         ]
         ax.legend(handles=legend_elements, loc='upper right')
-        plt.tight_layout()
         plt.savefig(self.results_dir / "spatial_reservoir_size_categories.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
 
         # 4) Complete infrastructure overview
         fig, ax = plt.subplots(figsize=(12, 8))
-        magasin_wgs84.plot(ax=ax, color='lightblue', alpha=0.4, edgecolor='none')
+        magasin_background.plot(ax=ax, color='lightblue', alpha=0.4, edgecolor='none', rasterized=True)
         dam_punkt_wgs84.plot(ax=ax, color='red', markersize=5, alpha=0.6, label='Dam Points')
         dam_linje_wgs84.plot(ax=ax, color='darkred', linewidth=1.8, alpha=0.8, label='Dam Lines')
         ax.set_title('Complete Infrastructure Overview', fontweight='bold')
@@ -441,39 +478,40 @@ class NorwegianHydropowerAnalyzer:
         )
         ax.text(0.02, 0.02, stats_text, transform=ax.transAxes, bbox=dict(boxstyle='round', facecolor='white', alpha=0.9),
                 fontsize=10, fontweight='bold', va='bottom')
-        plt.tight_layout()
         plt.savefig(self.results_dir / "spatial_complete_overview.png", dpi=300, bbox_inches='tight')
         plt.close(fig)
     
+    @staticmethod
+    def _construction_year_stats(gdf):
+        """Summary entries for a dam layer from a single aggregation over idriftAar."""
+        years = gdf['idriftAar'].agg(['count', 'min', 'max', 'mean'])
+        has_years = years['count'] > 0
+        return {
+            'Total Count': len(gdf),
+            'With Construction Year': int(years['count']),
+            'Oldest Dam': int(years['min']) if has_years else 'N/A',
+            'Newest Dam': int(years['max']) if has_years else 'N/A',
+            'Average Construction Year': f"{years['mean']:.0f}" if has_years else 'N/A'
+        }
+    
     def create_statistical_summary(self):
         """Create comprehensive statistical summary."""
         print("\n📈 Creating statistical summary...")
         
-        # Calculate comprehensive statistics
+        # Calculate comprehensive statistics, one aggregation pass per layer
+        reservoir_stats = self.magasin_gdf[['areal_km2', 'volOppdemt']].agg(['count', 'sum', 'mean', 'max'])
         stats_summary = {
-            'Dam Lines': {
-                'Total Count': len(self.dam_linje_gdf),
-                'With Construction Year': len(self.dam_linje_gdf.dropna(subset=['idriftAar'])),
-                'Oldest Dam': int(self.dam_linje_gdf['idriftAar'].min()) if not self.dam_linje_gdf['idriftAar'].isna().all() else 'N/A',
-                'Newest Dam': int(self.dam_linje_gdf['idriftAar'].max()) if not self.dam_linje_gdf['idriftAar'].isna().all() else 'N/A',
-                'Average Construction Year': f"{self.dam_linje_gdf['idriftAar'].mean():.0f}" if not self.dam_linje_gdf['idriftAar'].isna().all() else 'N/A'
-            },
-            'Dam Points': {
-                'Total Count': len(self.dam_punkt_gdf),
-                'With Construction Year': len(self.dam_punkt_gdf.dropna(subset=['idriftAar'])),
-                'Oldest Dam': int(self.dam_punkt_gdf['idriftAar'].min()) if not self.dam_punkt_gdf['idriftAar'].isna().all() else 'N/A',
-                'Newest Dam': int(self.dam_punkt_gdf['idriftAar'].max()) if not self.dam_punkt_gdf['idriftAar'].isna().all() else 'N/A',
-                'Average Construction Year': f"{self.dam_punkt_gdf['idriftAar'].mean():.0f}" if not self.dam_punkt_gdf['idriftAar'].isna().all() else 'N/A'
-            },
+            'Dam Lines': self._construction_year_stats(self.dam_linje_gdf),
+            'Dam Points': self._construction_year_stats(self.dam_punkt_gdf),
             'Reservoirs': {
                 'Total Count': len(self.magasin_gdf),
-                'With Area Data': len(self.magasin_gdf.dropna(subset=['areal_km2'])),
-                'With Volume Data': len(self.magasin_gdf.dropna(subset=['volOppdemt'])),
-                'Total Area (km²)': f"{self.magasin_gdf['areal_km2'].sum():.2f}",
-                'Average Area (km²)': f"{self.magasin_gdf['areal_km2'].mean():.2f}",
-                'Largest Reservoir (km²)': f"{self.magasin_gdf['areal_km2'].max():.2f}",
-                'Total Volume (million m³)': f"{self.magasin_gdf['volOppdemt'].sum():.1f}",
-                'Average Volume (million m³)': f"{self.magasin_gdf['volOppdemt'].mean():.1f}"
+                'With Area Data': int(reservoir_stats.at['count', 'areal_km2']),
+                'With Volume Data': int(reservoir_stats.at['count', 'volOppdemt']),
+                'Total Area (km²)': f"{reservoir_stats.at['sum', 'areal_km2']:.2f}",
+                'Average Area (km²)': f"{reservoir_stats.at['mean', 'areal_km2']:.2f}",
+                'Largest Reservoir (km²)': f"{reservoir_stats.at['max', 'areal_km2']:.2f}",
+                'Total Volume (million m³)': f"{reservoir_stats.at['sum', 'volOppdemt']:.1f}",
+                'Average Volume (million m³)': f"{reservoir_stats.at['mean', 'volOppdemt']:.1f}"
             }
         }
         
@@ -506,6 +544,8 @@ class NorwegianHydropowerAnalyzer:
         """Run the complete Norwegian hydropower analysis."""
         print("🚀 Starting Norwegian Hydropower Analysis")
         print("=" * 60)
+
+        configure_plot_style()
         
         # Create all enhanced visualizations
         self.create_enhanced_reservoir_analysis()
@@ -13,19 +13,24 @@ Complete REST API for real-time Norwegian dam health monitoring
 API Documentation: http://localhost:8000/docs
 """
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 import asyncpg
 import asyncio
+import bisect
+import functools
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import os
 import json
+import hashlib
 import logging
+import time
 from pathlib import Path
 import uvicorn
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from contextlib import asynccontextmanager
 
 # Import our Norwegian APIs
@@ -48,6 +53,28 @@ from api.arctic_risk_analyzer import ArcticRiskAnalyzer, create_arctic_tables
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Integrated risk bands: a score strictly above a threshold moves to the next level
+_RISK_THRESHOLDS = (40, 60, 80)
+_RISK_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+# Per-request deadline for the comprehensive risk endpoint; subsystems that miss it
+# are reported as degraded and filled from their last known good result. They keep
+# running in the background, so a slow subsystem still refreshes that result.
+COMPREHENSIVE_RISK_TIMEOUT_S = float(os.getenv('COMPREHENSIVE_RISK_TIMEOUT_S', '0.5'))
+LAST_GOOD_RESULT_TTL_S = 3600
+
+# Interactive queries fail fast through the pool's command_timeout; the batch health
+# recalculation loops over every active dam and gets its own, much longer budget
+DB_COMMAND_TIMEOUT_S = 10
+HEALTH_RECALC_TIMEOUT_S = float(os.getenv('HEALTH_RECALC_TIMEOUT_S', '600'))
+LAST_GOOD_RESULT_MAX_ENTRIES = 4096
+_last_good_results: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+_subsystem_tasks: Dict[Tuple[str, int], asyncio.Task] = {}
+
+# Assessments for different dams run concurrently, so each dam gets its own SHM
+# instance instead of re-pointing the shared one at a new dam_id mid-flight
+SHM_INSTANCE_CACHE_SIZE = 256
+
 # Pydantic models for API responses
 class DamInfo(BaseModel):
     dam_id: int
@@ -63,6 +90,9 @@ class DamInfo(BaseModel):
     latitude: Optional[float]
     longitude: Optional[float]
 
+# Validates and serializes a whole page of dams in one pydantic-core pass
+_dam_list_adapter = TypeAdapter(List[DamInfo])
+
 class HealthScore(BaseModel):
     dam_id: int
     dam_name: Optional[str]
@@ -201,6 +231,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (SHM strain series, comprehensive risk analysis)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include failure analysis router
 app.include_router(failure_router)
 
@@ -216,11 +249,14 @@ async def startup_event():
             f"@timescaledb:5432/postgres"
         )
         
+        # Size the pool so that max_size >= uvicorn workers * expected concurrency per worker;
+        # idle connections are closed and reopened on demand before Postgres or a NAT drops them
         db_pool = await asyncpg.create_pool(
             DATABASE_URL,
-            min_size=5,
-            max_size=20,
-            command_timeout=60
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '10')),
+            max_size=int(os.getenv('DB_POOL_MAX_SIZE', '50')),
+            max_inactive_connection_lifetime=300,
+            command_timeout=DB_COMMAND_TIMEOUT_S
         )
         
         logger.info("✅ Database connection established")
@@ -272,6 +308,14 @@ async def startup_event():
             global shm_system
             shm_system = IntegratedSHMSystem(dam_id=1)  # Default dam for system operations
             await create_shm_tables(db_pool)
+            
+            # Run the fiber optic pipeline once so the first /shm request does not
+            # pay for lazy imports and first-call setup of the numeric code
+            warmup_readings = shm_system.fiber_optic.simulate_fiber_measurement({
+                'water_level': 70,
+                'temperature_variation': 5
+            })
+            shm_system.fiber_optic.detect_anomalies(warmup_readings)
             logger.info("✅ SHM technology system initialized")
         except Exception as e:
             logger.warning(f"⚠️ SHM system initialization failed: {e}")
@@ -299,6 +343,18 @@ async def shutdown_event():
     
     logger.info("✅ Shutdown complete")
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (a list of tags or '*') against an ETag"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
 async def get_db():
     """Database dependency"""
     if not db_pool:
@@ -382,6 +438,7 @@ async def get_monitoring_stats(db: asyncpg.Pool = Depends(get_db)):
 
 @app.get("/dams", response_model=List[DamInfo])
 async def get_dams(
+    request: Request,
     limit: int = Query(100, le=1000),
     offset: int = Query(0, ge=0),
     municipality: Optional[str] = None,
@@ -391,6 +448,18 @@ async def get_dams(
 ):
     """Get list of dams with optional filtering"""
     try:
+        # Dam metadata changes rarely: derive an ETag from the table version (updated_at
+        # is maintained by a BEFORE UPDATE trigger) and the query string so polling
+        # clients get a 304 without the list being rebuilt
+        async with db.acquire() as conn:
+            version = await conn.fetchrow("SELECT MAX(updated_at) AS updated, COUNT(*) AS total FROM dams")
+        etag_source = f"{version['updated']}|{version['total']}|{request.url.query}"
+        etag = f'"{hashlib.blake2b(etag_source.encode(), digest_size=8).hexdigest()}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+        
+        if _etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=cache_headers)
+        
         query = """
             SELECT dam_id, nve_dam_nr, dam_name, municipality, county, owner,
                    construction_year, dam_height_m, status, risk_level,
@@ -422,7 +491,13 @@ async def get_dams(
         
         async with db.acquire() as conn:
             rows = await conn.fetch(query, *params)
-            return [DamInfo(**dict(row)) for row in rows]
+        
+        dams = _dam_list_adapter.validate_python([dict(row) for row in rows])
+        return Response(
+            content=_dam_list_adapter.dump_json(dams),
+            media_type="application/json",
+            headers=cache_headers
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dams: {str(e)}")
 
@@ -442,7 +517,7 @@ async def get_dam_details(dam_id: int, db: asyncpg.Pool = Depends(get_db)):
             if not row:
                 raise HTTPException(status_code=404, detail="Dam not found")
             
-            return DamInfo(**dict(row))
+            return DamInfo(**row)
     except HTTPException:
         raise
     except Exception as e:
@@ -468,7 +543,7 @@ async def get_dams_overview(
                 LIMIT $1
             """, limit)
             
-            return [DamOverview(**dict(row)) for row in rows]
+            return [DamOverview(**row) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dam overview: {str(e)}")
 
@@ -493,7 +568,7 @@ async def get_dam_health(dam_id: int, db: asyncpg.Pool = Depends(get_db)):
             if not row:
                 raise HTTPException(status_code=404, detail="Health data not found for dam")
             
-            return HealthScore(**dict(row))
+            return HealthScore(**row)
     except HTTPException:
         raise
     except Exception as e:
@@ -587,7 +662,7 @@ async def get_sensor_data(
         
         async with db.acquire() as conn:
             rows = await conn.fetch(query, *params)
-            return [SensorReading(**dict(row)) for row in rows]
+            return [SensorReading(**row) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching sensor data: {str(e)}")
 
@@ -622,7 +697,7 @@ async def get_weather_data(
         
         async with db.acquire() as conn:
             rows = await conn.fetch(query, *params)
-            return [WeatherReading(**dict(row)) for row in rows]
+            return [WeatherReading(**row) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching weather data: {str(e)}")
 
@@ -682,7 +757,7 @@ async def get_alerts(
         
         async with db.acquire() as conn:
             rows = await conn.fetch(query, *params)
-            return [Alert(**dict(row)) for row in rows]
+            return [Alert(**row) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching alerts: {str(e)}")
 
@@ -705,7 +780,7 @@ async def get_dam_alerts(
                 ORDER BY a.created_at DESC
             """, dam_id, status)
             
-            return [Alert(**dict(row)) for row in rows]
+            return [Alert(**row) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dam alerts: {str(e)}")
 
@@ -734,8 +809,8 @@ async def trigger_data_collection(
             if not row:
                 raise HTTPException(status_code=404, detail="Dam not found")
         
-        # Schedule background data collection
-        background_tasks.add_task(collect_and_store_dam_data, dam_id, row['lat'], row['lon'])
+        # Schedule background data collection through the same path as the batch collector
+        background_tasks.add_task(monitoring_api.collect_many, [(dam_id, row['lat'], row['lon'])], db_pool)
         
         return {"message": f"Data collection triggered for dam {dam_id}", "status": "scheduled"}
     except HTTPException:
@@ -778,51 +853,48 @@ async def background_monitoring():
                     ORDER BY RANDOM() 
                     LIMIT 25
                 """)
-                
-                if not sample_dams:
-                    logger.warning("⚠️ No dams with coordinates found for monitoring")
-                    await asyncio.sleep(600)  # Wait 10 minutes
-                    continue
-                
-                logger.info(f"📡 Collecting real-time data for {len(sample_dams)} Norwegian dams...")
-                
-                # Collect weather data for sample dams
-                for dam in sample_dams:
-                    try:
-                        # Get real Norwegian weather data
-                        weather_data = await monitoring_api.met_no.get_current_weather(
-                            dam['latitude'], dam['longitude']
-                        )
-                        
-                        if weather_data:
-                            # Insert real weather data
-                            await connection.execute("""
-                                INSERT INTO weather_data 
-                                (time, dam_id, temperature_c, precipitation_mm, wind_speed_ms, humidity_percent, data_source)
-                                VALUES (NOW(), $1, $2, $3, $4, $5, 'met.no_live')
-                            """, 
-                            dam['dam_id'],
-                            weather_data.temperature or 0,
-                            weather_data.precipitation or 0,
-                            weather_data.wind_speed or 0,
-                            weather_data.humidity or 50
-                            )
-                            
-                            logger.info(f"✅ Live weather data collected for {dam['dam_name']}")
-                        
-                        # Add small delay between API calls
-                        await asyncio.sleep(2)
-                        
-                    except Exception as e:
-                        logger.error(f"❌ Error collecting data for dam {dam['dam_name']}: {e}")
-                
-                # Update health scores based on new data
+            
+            if not sample_dams:
+                logger.warning("⚠️ No dams with coordinates found for monitoring")
+                await asyncio.sleep(600)  # Wait 10 minutes
+                continue
+            
+            logger.info(f"📡 Collecting real-time data for {len(sample_dams)} Norwegian dams...")
+            
+            # Collect weather data for sample dams; inserts run off the collection path
+            # on their own pooled connections instead of pinning one for the whole cycle
+            pending_writes = []
+            for dam in sample_dams:
+                try:
+                    # Get real Norwegian weather data
+                    weather_data = await monitoring_api.met_no.get_current_weather(
+                        dam['latitude'], dam['longitude']
+                    )
+                    
+                    if weather_data:
+                        pending_writes.append(asyncio.create_task(
+                            _persist_live_weather(db_pool, dam['dam_id'], weather_data)
+                        ))
+                        logger.info(f"✅ Live weather data collected for {dam['dam_name']}")
+                    
+                    # Add small delay between API calls
+                    await asyncio.sleep(2)
+                    
+                except Exception as e:
+                    logger.error(f"❌ Error collecting data for dam {dam['dam_name']}: {e}")
+            
+            for result in await asyncio.gather(*pending_writes, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Error storing live weather data: {result}")
+            
+            # Update health scores based on new data
+            async with db_pool.acquire() as connection:
                 await connection.execute("""
                     SELECT update_all_dam_health_scores()
-                """)
-                
-                logger.info(f"✅ Monitoring cycle complete - collected live Norwegian data")
-                
+                """, timeout=HEALTH_RECALC_TIMEOUT_S)
+            
+            logger.info(f"✅ Monitoring cycle complete - collected live Norwegian data")
+            
         except Exception as e:
             logger.error(f"❌ Background monitoring error: {e}")
         
@@ -831,6 +903,21 @@ async def background_monitoring():
         logger.info(f"💤 Waiting {collection_interval} minutes until next monitoring cycle...")
         await asyncio.sleep(collection_interval * 60)
 
+async def _persist_live_weather(pool: asyncpg.Pool, dam_id: int, weather_data):
+    """Store a live met.no reading using a connection of its own"""
+    async with pool.acquire() as connection:
+        await connection.execute("""
+            INSERT INTO weather_data 
+            (time, dam_id, temperature_c, precipitation_mm, wind_speed_ms, humidity_percent, data_source)
+            VALUES (NOW(), $1, $2, $3, $4, $5, 'met.no_live')
+        """, 
+        dam_id,
+        weather_data.temperature or 0,
+        weather_data.precipitation or 0,
+        weather_data.wind_speed or 0,
+        weather_data.humidity or 50
+        )
+
 async def collect_all_dams_data():
     """Collect data for all active dams"""
     try:
@@ -844,42 +931,27 @@ async def collect_all_dams_data():
                 ORDER BY RANDOM()
                 LIMIT $1
             """, batch_size)
-            
-            logger.info(f"Collecting data for {len(rows)} dams...")
-            
-            # Process dams in parallel
-            tasks = []
-            for row in rows:
-                if row['lat'] and row['lon']:
-                    task = collect_and_store_dam_data(row['dam_id'], row['lat'], row['lon'])
-                    tasks.append(task)
-            
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
-                logger.info(f"✅ Data collection completed for {len(tasks)} dams")
-                
-    except Exception as e:
-        logger.error(f"Error in collect_all_dams_data: {e}")
-
-async def collect_and_store_dam_data(dam_id: int, lat: float, lon: float):
-    """Collect and store data for a single dam"""
-    try:
-        # Collect data from all Norwegian APIs
-        data = await monitoring_api.collect_dam_data(dam_id, lat, lon)
         
-        # Store in database
-        await monitoring_api.store_data(data, db_pool)
-        
-        logger.info(f"✅ Data collected and stored for dam {dam_id}")
+        # The connection goes back to the pool before the slow API calls start
+        dams = [(row['dam_id'], row['lat'], row['lon']) for row in rows if row['lat'] and row['lon']]
+        logger.info(f"Collecting data for {len(dams)} dams...")
         
+        if dams:
+            collected = await monitoring_api.collect_many(
+                dams, db_pool, max_concurrent=int(os.getenv('COLLECT_CONCURRENCY', '16'))
+            )
+            logger.info(f"✅ Data collection completed for {len(collected)}/{len(dams)} dams")
+                
     except Exception as e:
-        logger.error(f"Error collecting data for dam {dam_id}: {e}")
+        logger.error(f"Error in collect_all_dams_data: {e}")
 
 async def update_health_scores():
     """Update health scores for all dams"""
     try:
         async with db_pool.acquire() as conn:
-            updated_count = await conn.fetchval("SELECT update_all_dam_health_scores()")
+            updated_count = await conn.fetchval(
+                "SELECT update_all_dam_health_scores()", timeout=HEALTH_RECALC_TIMEOUT_S
+            )
             logger.info(f"✅ Updated health scores for {updated_count} dams")
     except Exception as e:
         logger.error(f"Error updating health scores: {e}")
@@ -1045,9 +1117,6 @@ async def run_shm_assessment(dam_id: int, height: float = Query(50), length: flo
         if not shm_system:
             raise HTTPException(status_code=503, detail="SHM system not initialized")
         
-        # Update dam ID for specific assessment
-        shm_system.dam_id = dam_id
-        
         dam_properties = {
             'height': height,
             'length': length,
@@ -1056,7 +1125,7 @@ async def run_shm_assessment(dam_id: int, height: float = Query(50), length: flo
             'temp_variation': temp_variation
         }
         
-        assessment = await shm_system.perform_comprehensive_assessment(dam_properties)
+        assessment = await _shm_for_dam(dam_id).perform_comprehensive_assessment(dam_properties)
         
         return SHMAssessment(
             dam_id=assessment['dam_id'],
@@ -1120,58 +1189,116 @@ async def get_comprehensive_risk_analysis(dam_id: int, latitude: float = Query(.
     try:
         results = {}
         
-        # ML Risk Prediction
+        # Run ML, Arctic and SHM assessments concurrently under a shared deadline;
+        # stragglers are not cancelled but left to refresh the last good result
+        tasks = {}
         if ml_predictor:
-            try:
-                ml_risk = await ml_predictor.predict_dam_risk(dam_id)
-                results['ml_prediction'] = ml_risk
-            except Exception as e:
-                results['ml_prediction'] = {"error": str(e)}
-        
-        # Arctic Risk Analysis
+            tasks['ml_prediction'] = _subsystem_task(
+                'ml_prediction', dam_id, lambda: ml_predictor.predict_dam_risk(dam_id)
+            )
         if arctic_analyzer:
-            try:
-                arctic_risk = await arctic_analyzer.analyze_arctic_risks(dam_id, latitude)
-                results['arctic_analysis'] = arctic_risk
-            except Exception as e:
-                results['arctic_analysis'] = {"error": str(e)}
-        
-        # SHM Assessment
+            tasks['arctic_analysis'] = _subsystem_task(
+                'arctic_analysis', dam_id, lambda: arctic_analyzer.analyze_arctic_risks(dam_id, latitude)
+            )
         if shm_system:
-            try:
-                shm_system.dam_id = dam_id
-                shm_assessment = await shm_system.perform_comprehensive_assessment({
-                    'height': 50, 'length': 200, 'thickness': 10, 
-                    'water_level': 65, 'temp_variation': 5
-                })
-                results['shm_assessment'] = shm_assessment
-            except Exception as e:
-                results['shm_assessment'] = {"error": str(e)}
+            tasks['shm_assessment'] = _subsystem_task(
+                'shm_assessment', dam_id, lambda: _default_shm_assessment(dam_id)
+            )
         
-        # Calculate integrated risk score
-        risk_scores = []
-        if 'ml_prediction' in results and 'risk_score' in results['ml_prediction']:
-            risk_scores.append(results['ml_prediction']['risk_score'])
-        if 'arctic_analysis' in results and 'overall_arctic_risk' in results['arctic_analysis']:
-            risk_scores.append(results['arctic_analysis']['overall_arctic_risk'])
-        if 'shm_assessment' in results and 'integrated_health_score' in results['shm_assessment']:
-            risk_scores.append(100 - results['shm_assessment']['integrated_health_score'])  # Convert health to risk
+        done = set()
+        if tasks:
+            done, _ = await asyncio.wait(tasks.values(), timeout=COMPREHENSIVE_RISK_TIMEOUT_S)
+        
+        degraded = []
+        for name, task in tasks.items():
+            if task in done:
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    results[name] = {"error": str(e)}
+            else:
+                degraded.append(name)
+                results[name] = _last_good_result(name, dam_id) or {
+                    "error": f"Timed out after {COMPREHENSIVE_RISK_TIMEOUT_S}s; still running in the background"
+                }
         
-        integrated_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 0
+        results['degraded'] = degraded
         
-        results['integrated_risk_score'] = round(integrated_risk, 2)
-        results['risk_level'] = (
-            "CRITICAL" if integrated_risk > 80 else
-            "HIGH" if integrated_risk > 60 else
-            "MEDIUM" if integrated_risk > 40 else
-            "LOW"
-        )
+        # Calculate integrated risk score from the subsystems that produced one
+        risk_scores = []
+        skipped = []
+        for name, key, to_risk in (
+            ('ml_prediction', 'risk_score', lambda v: v),
+            ('arctic_analysis', 'overall_arctic_risk', lambda v: v),
+            ('shm_assessment', 'integrated_health_score', lambda v: 100 - v),  # Convert health to risk
+        ):
+            if name in results and key in results[name]:
+                risk_scores.append(to_risk(results[name][key]))
+            else:
+                skipped.append(name)
+        results['skipped'] = skipped
+        
+        # With no score at all the risk is unknown; never report LOW for lack of data
+        if risk_scores:
+            integrated_risk = sum(risk_scores) / len(risk_scores)
+            results['integrated_risk_score'] = round(integrated_risk, 2)
+            results['risk_level'] = _RISK_LEVELS[bisect.bisect_left(_RISK_THRESHOLDS, integrated_risk)]
+        else:
+            results['integrated_risk_score'] = None
+            results['risk_level'] = "UNKNOWN"
         results['analysis_timestamp'] = datetime.now().isoformat()
         
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comprehensive analysis failed: {str(e)}")
 
+@functools.lru_cache(maxsize=SHM_INSTANCE_CACHE_SIZE)
+def _shm_for_dam(dam_id: int) -> IntegratedSHMSystem:
+    """SHM instance bound to one dam; never mutate the shared shm_system"""
+    return IntegratedSHMSystem(dam_id=dam_id)
+
+async def _default_shm_assessment(dam_id: int) -> Dict[str, Any]:
+    """Run the SHM assessment with the default dam properties"""
+    return await _shm_for_dam(dam_id).perform_comprehensive_assessment({
+        'height': 50, 'length': 200, 'thickness': 10, 
+        'water_level': 65, 'temp_variation': 5
+    })
+
+def _subsystem_task(name: str, dam_id: int, factory) -> asyncio.Task:
+    """Start a subsystem assessment, or join the one already running for this dam"""
+    key = (name, dam_id)
+    task = _subsystem_tasks.get(key)
+    if task is None:
+        task = asyncio.create_task(factory())
+        _subsystem_tasks[key] = task
+        task.add_done_callback(functools.partial(_record_subsystem_result, key))
+    return task
+
+def _record_subsystem_result(key: Tuple[str, int], task: asyncio.Task):
+    """Done-callback: keep a successful result as the last good one, even after the deadline"""
+    _subsystem_tasks.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    
+    now = time.monotonic()
+    _last_good_results.pop(key, None)
+    _last_good_results[key] = (now, task.result())
+    
+    # Entries stay in write order, so expired and overflow entries are at the front
+    while _last_good_results:
+        oldest_key, (stored_at, _) = next(iter(_last_good_results.items()))
+        if (now - stored_at < LAST_GOOD_RESULT_TTL_S
+                and len(_last_good_results) <= LAST_GOOD_RESULT_MAX_ENTRIES):
+            break
+        del _last_good_results[oldest_key]
+
+def _last_good_result(name: str, dam_id: int) -> Optional[Dict[str, Any]]:
+    """Return the last successful subsystem result if it is still fresh"""
+    cached = _last_good_results.get((name, dam_id))
+    if cached and time.monotonic() - cached[0] < LAST_GOOD_RESULT_TTL_S:
+        return cached[1]
+    return None
+
 # ==================================================================================
 # APPLICATION STARTUP
 # ==================================================================================
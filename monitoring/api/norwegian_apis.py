@@ -15,20 +15,92 @@ All APIs use your real credentials configured in .env
 
 import aiohttp
 import asyncio
-import json
+from array import array
+import atexit
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from logging.handlers import QueueHandler, QueueListener
+import math
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Dict, List, Optional, Tuple, Any
 import os
+import queue
+import sys
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 import asyncpg
+from multidict import CIMultiDict
+from yarl import URL
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; station search falls back to NumPy
+    njit = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; the NVE station list is then parsed in one go
+    ijson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional; used for lazy field access on the NVE station list
+    simdjson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_dt
+except ImportError:  # ciso8601 is optional; 3.11+ fromisoformat accepts a trailing 'Z' itself
+    if sys.version_info >= (3, 11):
+        _parse_dt = datetime.fromisoformat
+    else:
+        def _parse_dt(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:  # orjson is pinned in requirements; stdlib json keeps the module usable without it
+    import json
+    
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=lambda value: value.tolist())
+
+def _configure_logging():
+    """
+    Route records through a queue so the StreamHandler's stderr writes happen on
+    a listener thread instead of blocking the event loop. Leaves an already
+    configured root logger alone, as logging.basicConfig does.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+_configure_logging()
 logger = logging.getLogger(__name__)
 
-@dataclass
+EARTH_RADIUS_KM = 6371.0
+CACHE_DIR = Path.home() / '.cache' / 'damhealth'
+
+@dataclass(slots=True)
 class WeatherData:
     """Weather data structure from Norwegian APIs"""
     timestamp: datetime
@@ -41,7 +113,7 @@ class WeatherData:
     snow_depth: Optional[float]
     source: str
 
-@dataclass
+@dataclass(slots=True)
 class WaterLevelData:
     """Water level data from NVE"""
     timestamp: datetime
@@ -51,7 +123,7 @@ class WaterLevelData:
     inflow: Optional[float]
     outflow: Optional[float]
 
-@dataclass
+@dataclass(slots=True)
 class SatelliteData:
     """Satellite observation data"""
     timestamp: datetime
@@ -64,80 +136,294 @@ class SatelliteData:
     water_surface_area: Optional[float]
     image_url: Optional[str]
 
-class MetNoAPI:
+def _create_session(**kwargs) -> aiohttp.ClientSession:
+    """
+    Create a long-lived ClientSession whose connector keeps connections alive
+    and caches DNS, so repeated calls to the same API skip the TCP/TLS handshake.
+    limit_per_host caps in-flight requests to each API when many dams are
+    collected at once, which keeps us clear of met.no/NVE rate limiting.
+    Request bodies are encoded with _json_dumps, which returns the str aiohttp expects.
+    """
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=600, keepalive_timeout=75)
+    return aiohttp.ClientSession(
+        connector=connector,
+        json_serialize=_json_dumps,
+        **kwargs
+    )
+
+def _haversine_term(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Haversine 'a' term from one point to arrays of points (all in degrees).
+    It grows monotonically with distance, so it can be ranked without the sqrt/arcsin.
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lats_rad, lons_rad = np.radians(lats), np.radians(lons)
+    return (np.sin((lats_rad - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lats_rad) * np.sin((lons_rad - lon1) / 2) ** 2)
+
+def _haversine_term_to_km(a: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+if njit is not None:
+    _haversine_term_to_km = njit(cache=True)(_haversine_term_to_km)
+    
+    # fastmath without 'nnan'/'ninf': best_a starts at inf, and a station with missing
+    # coordinates yields NaN, so both must keep their IEEE comparison semantics
+    @njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+    def _nearest_station_idx(lat, lon, lats, lons):
+        """Index of and distance (km) to the closest station, fused into one pass"""
+        lat1 = math.radians(lat)
+        lon1 = math.radians(lon)
+        cos_lat1 = math.cos(lat1)
+        best_idx = -1
+        best_a = np.inf
+        for i in range(lats.shape[0]):
+            lat2 = math.radians(lats[i])
+            dlat = lat2 - lat1
+            dlon = math.radians(lons[i]) - lon1
+            a = math.sin(dlat / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin(dlon / 2) ** 2
+            if a < best_a:
+                best_a = a
+                best_idx = i
+        return best_idx, _haversine_term_to_km(best_a)
+else:
+    def _nearest_station_idx(lat, lon, lats, lons):
+        """Index of and distance (km) to the closest station"""
+        a = _haversine_term(lat, lon, lats, lons)
+        best_idx = int(np.argmin(a))
+        return best_idx, _haversine_term_to_km(float(a[best_idx]))
+
+def _extract_timeseries_entry(entry: Dict[str, Any]) -> WeatherData:
+    """
+    Extract conditions from one locationforecast 2.0 compact timeseries entry.
+    The schema is fixed, so walk each level once and bind the lookup to a local.
+    """
+    entry_data = entry['data']
+    get = entry_data['instant']['details'].get
+    next_hour = entry_data.get('next_1_hours')
+    precipitation = next_hour['details'].get('precipitation_amount') if next_hour else None
+    
+    return WeatherData(
+        timestamp=_parse_dt(entry['time']),
+        temperature=get('air_temperature'),
+        precipitation=precipitation,
+        wind_speed=get('wind_speed'),
+        wind_direction=get('wind_from_direction'),
+        humidity=get('relative_humidity'),
+        pressure=get('air_pressure_at_sea_level'),
+        snow_depth=None,  # Not available in locationforecast
+        source='met.no'
+    )
+
+def _extract_current_weather(data: Dict[str, Any]) -> WeatherData:
+    """Extract current conditions from a locationforecast 2.0 compact document"""
+    return _extract_timeseries_entry(data['properties']['timeseries'][0])
+
+# Frost element ids in WeatherData field order (temperature ... snow_depth)
+FROST_ELEMENTS = [
+    'air_temperature', 'sum(precipitation_amount PT1H)', 'wind_speed', 'wind_from_direction',
+    'relative_humidity', 'air_pressure_at_sea_level', 'snow_depth'
+]
+
+def _frost_observations_to_weather(observations: List[Dict[str, Any]]) -> List[WeatherData]:
+    """
+    Pivot Frost's one-row-per-element observations into one WeatherData per Frost record.
+    Flattening once and pivoting in pandas avoids a per-element Python branch for every record.
+    """
+    if not observations:
+        return []
+    
+    # Key element values by record position so every Frost record yields exactly one
+    # WeatherData, in order, even when all of its elements are null or missing
+    rows = [
+        (position, obs['elementId'], obs.get('value'))
+        for position, observation in enumerate(observations)
+        for obs in observation.get('observations', [])
+    ]
+    if rows:
+        df = pd.DataFrame(rows, columns=['record', 'elementId', 'value'])
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        wide = (
+            df.groupby(['record', 'elementId'])['value'].last()
+            .unstack()
+            .reindex(index=range(len(observations)), columns=FROST_ELEMENTS)
+        )
+    else:
+        wide = pd.DataFrame(index=range(len(observations)), columns=FROST_ELEMENTS, dtype=float)
+    timestamps = pd.to_datetime(
+        [observation['referenceTime'] for observation in observations], utc=True, format='ISO8601'
+    ).to_pydatetime()
+    wide = wide.astype(object).where(wide.notna(), None)
+    
+    # FROST_ELEMENTS follows the WeatherData field order, so each row unpacks positionally
+    return [
+        WeatherData(timestamp, *values, 'frost')
+        for timestamp, values in zip(timestamps, wide.itertuples(index=False, name=None))
+    ]
+
+class BackpressureController:
+    """
+    AIMD concurrency limit for one rate-limited provider: the limit grows
+    additively on success, halves on 429/5xx or transport errors, and new
+    requests wait out any Retry-After the provider sends
+    """
+    
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 16, increase: float = 0.5):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        if isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError)):
+            self._decrease()
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+    
+    def record(self, status: int, retry_after: Optional[str] = None):
+        """Adjust the limit from a response status and optional Retry-After seconds"""
+        if status == 429 or status >= 500:
+            self._decrease()
+            if retry_after:
+                try:
+                    self._paused_until = max(self._paused_until, time.monotonic() + float(retry_after))
+                except ValueError:
+                    pass  # HTTP-date form; the halved limit still applies
+        elif status < 400:
+            self.limit = min(self.maximum, self.limit + self.increase)
+    
+    def _decrease(self):
+        self.limit = max(self.minimum, self.limit / 2)
+
+class _SessionClient:
+    """
+    Base for the API clients: uses the ClientSession injected by
+    HealthMonitoringAPI, or lazily owns one when used standalone
+    """
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
+        self._owns_session = session is None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = _create_session()
+            self._owns_session = True
+        return self.session
+    
+    async def close(self):
+        # A shared session belongs to HealthMonitoringAPI, which closes it once
+        if self.session and self._owns_session:
+            await self.session.close()
+
+class MetNoAPI(_SessionClient):
     """
     Integration with met.no APIs for real-time Norwegian weather data
     https://api.met.no/
     """
     
     BASE_URL = "https://api.met.no/weatherapi"
+    FORECAST_URL = URL(f"{BASE_URL}/locationforecast/2.0/compact")
+    FORECAST_TTL = 600  # seconds
+    FORECAST_CACHE_SIZE = 1024
     
-    def __init__(self):
-        self.session = None
-        self.headers = {
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
+        # (lat, lon) -> (fetched_at, Last-Modified, document), least recently used first;
+        # expired entries stay for revalidation until pushed out by FORECAST_CACHE_SIZE
+        self._forecast_cache: OrderedDict[Tuple[float, float], Tuple[float, Optional[str], Dict[str, Any]]] = OrderedDict()
+        self.headers = CIMultiDict({
             'User-Agent': 'NorwegianDamMonitoring/1.0 (taief@example.com)'
-        }
+        })
     
-    async def _get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers=self.headers)
-        return self.session
+    async def _fetch_location_forecast(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the raw locationforecast document, shared by the current and forecast views.
+        Responses are kept for FORECAST_TTL seconds and then revalidated with
+        If-Modified-Since, so unchanged forecasts come back as a body-less 304.
+        """
+        # met.no asks for at most 4 decimals; rounding also lets nearby dams share an entry
+        key = (round(lat, 4), round(lon, 4))
+        now = time.monotonic()
+        cached = self._forecast_cache.get(key)
+        if cached is not None:
+            self._forecast_cache.move_to_end(key)
+            if now - cached[0] < self.FORECAST_TTL:
+                return cached[2]
+        
+        session = await self._get_session()
+        params = {'lat': key[0], 'lon': key[1]}
+        headers = self.headers
+        if cached is not None and cached[1]:
+            headers = headers.copy()
+            headers['If-Modified-Since'] = cached[1]
+        
+        async with session.get(self.FORECAST_URL, params=params, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                self._forecast_cache[key] = (now, cached[1], cached[2])
+                return cached[2]
+            if response.status == 200:
+                data = _json_loads(await response.read())
+                self._forecast_cache[key] = (now, response.headers.get('Last-Modified'), data)
+                if len(self._forecast_cache) > self.FORECAST_CACHE_SIZE:
+                    self._forecast_cache.popitem(last=False)
+                return data
+            logger.error("met.no API error: %s", response.status)
+            return None
     
     async def get_current_weather(self, lat: float, lon: float) -> Optional[WeatherData]:
         """Get current weather conditions for a location"""
         try:
-            session = await self._get_session()
-            url = f"{self.BASE_URL}/locationforecast/2.0/compact"
-            params = {'lat': lat, 'lon': lon}
-            
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Extract current conditions
-                    current = data['properties']['timeseries'][0]
-                    instant = current['data']['instant']['details']
-                    
-                    return WeatherData(
-                        timestamp=datetime.fromisoformat(current['time'].replace('Z', '+00:00')),
-                        temperature=instant.get('air_temperature'),
-                        precipitation=current['data'].get('next_1_hours', {}).get('details', {}).get('precipitation_amount'),
-                        wind_speed=instant.get('wind_speed'),
-                        wind_direction=instant.get('wind_from_direction'),
-                        humidity=instant.get('relative_humidity'),
-                        pressure=instant.get('air_pressure_at_sea_level'),
-                        snow_depth=None,  # Not available in locationforecast
-                        source='met.no'
-                    )
-                else:
-                    logger.error(f"met.no API error: {response.status}")
-                    return None
+            data = await self._fetch_location_forecast(lat, lon)
+            return _extract_current_weather(data) if data else None
         except Exception as e:
-            logger.error(f"Error fetching met.no data: {e}")
+            logger.error("Error fetching met.no data: %s", e)
             return None
     
-    async def close(self):
-        if self.session:
-            await self.session.close()
+    async def get_weather_forecast(self, lat: float, lon: float, hours: int = 24) -> List[WeatherData]:
+        """Get the hourly forecast for the next `hours` entries"""
+        try:
+            data = await self._fetch_location_forecast(lat, lon)
+            if not data:
+                return []
+            extract = _extract_timeseries_entry
+            return [extract(entry) for entry in data['properties']['timeseries'][:hours]]
+        except Exception as e:
+            logger.error("Error fetching met.no forecast: %s", e)
+            return []
 
-class FrostAPI:
+class FrostAPI(_SessionClient):
     """
     Integration with Frost API for historical Norwegian weather data
     https://frost.met.no/
     """
     
     BASE_URL = "https://frost.met.no/observations/v0.jsonld"
+    OBSERVATIONS_URL = URL(BASE_URL)
+    SOURCES_URL = URL("https://frost.met.no/sources/v0.jsonld")
+    NEAREST_STATION_TTL = 86400  # A dam's nearest station practically never changes
     
-    def __init__(self, client_id: str):
+    def __init__(self, client_id: str, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.client_id = client_id
-        self.session = None
+        self._backpressure = BackpressureController()
+        # (lat, lon) rounded to ~100 m -> (looked_up_at, station id)
+        self._nearest_cache: Dict[Tuple[float, float], Tuple[float, Optional[str]]] = {}
         self.auth = aiohttp.BasicAuth(client_id, '')  # Frost uses client_id as username, empty password
     
-    async def _get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(auth=self.auth)
-        return self.session
-    
     async def get_historical_weather(self, station_id: str, start_date: datetime, end_date: datetime) -> List[WeatherData]:
         """Get historical weather data from Frost API"""
         try:
@@ -146,117 +432,115 @@ class FrostAPI:
             params = {
                 'sources': station_id,
                 'referencetime': f"{start_date.isoformat()}/{end_date.isoformat()}",
-                'elements': 'air_temperature,sum(precipitation_amount PT1H),wind_speed,wind_from_direction,relative_humidity,air_pressure_at_sea_level,snow_depth'
+                'elements': ','.join(FROST_ELEMENTS)
             }
             
-            async with session.get(self.BASE_URL, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    weather_data = []
-                    
-                    for observation in data.get('data', []):
-                        # Parse observation data
-                        timestamp = datetime.fromisoformat(observation['referenceTime'].replace('Z', '+00:00'))
-                        
-                        # Extract values from observations array
-                        values = {}
-                        for obs in observation.get('observations', []):
-                            element = obs['elementId']
-                            value = obs.get('value')
-                            if value is not None:
-                                values[element] = float(value)
-                        
-                        weather_data.append(WeatherData(
-                            timestamp=timestamp,
-                            temperature=values.get('air_temperature'),
-                            precipitation=values.get('sum(precipitation_amount PT1H)'),
-                            wind_speed=values.get('wind_speed'),
-                            wind_direction=values.get('wind_from_direction'),
-                            humidity=values.get('relative_humidity'),
-                            pressure=values.get('air_pressure_at_sea_level'),
-                            snow_depth=values.get('snow_depth'),
-                            source='frost'
-                        ))
-                    
-                    return weather_data
-                else:
-                    logger.error(f"Frost API error: {response.status}")
-                    return []
+            async with self._backpressure:
+                async with session.get(self.OBSERVATIONS_URL, params=params, auth=self.auth) as response:
+                    self._backpressure.record(response.status, response.headers.get('Retry-After'))
+                    if response.status == 200:
+                        data = _json_loads(await response.read())
+                        return _frost_observations_to_weather(data.get('data', []))
+                    else:
+                        logger.error("Frost API error: %s", response.status)
+                        return []
         except Exception as e:
-            logger.error(f"Error fetching Frost data: {e}")
+            logger.error("Error fetching Frost data: %s", e)
             return []
     
+    async def get_historical_weather_many(self, station_ids: List[str], start_date: datetime,
+                                          end_date: datetime) -> Dict[str, List[WeatherData]]:
+        """Fetch historical weather for several stations concurrently, keyed by station id"""
+        results = await asyncio.gather(
+            *(self.get_historical_weather(station_id, start_date, end_date) for station_id in station_ids)
+        )
+        return dict(zip(station_ids, results))
+    
     async def find_nearest_station(self, lat: float, lon: float) -> Optional[str]:
-        """Find the nearest weather station to given coordinates"""
+        """Find the nearest weather station to given coordinates, memoized per location"""
+        key = (round(lat, 3), round(lon, 3))
+        cached = self._nearest_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.NEAREST_STATION_TTL:
+            return cached[1]
+        
         try:
             session = await self._get_session()
-            url = "https://frost.met.no/sources/v0.jsonld"
             
             params = {
                 'geometry': f'nearest(POINT({lon} {lat}))',
                 'types': 'SensorSystem'
             }
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    sources = data.get('data', [])
-                    if sources:
-                        return sources[0]['id']
-                return None
+            async with self._backpressure:
+                async with session.get(self.SOURCES_URL, params=params, auth=self.auth) as response:
+                    self._backpressure.record(response.status, response.headers.get('Retry-After'))
+                    if response.status == 200:
+                        data = _json_loads(await response.read())
+                        sources = data.get('data', [])
+                        station_id = sources[0]['id'] if sources else None
+                        self._nearest_cache[key] = (time.monotonic(), station_id)
+                        return station_id
+                    return None
         except Exception as e:
-            logger.error(f"Error finding nearest station: {e}")
+            logger.error("Error finding nearest station: %s", e)
             return None
-    
-    async def close(self):
-        if self.session:
-            await self.session.close()
 
-class NVEHydrologyAPI:
+def _columnar_catalog(ids: List[str], names: List[Optional[str]], lats: array, lons: array) -> Dict[str, Any]:
+    """Wrap incrementally built station columns in the catalog layout, without copying"""
+    return {
+        'ids': ids,
+        'names': names,
+        'lats': np.frombuffer(lats, dtype=np.float64),
+        'lons': np.frombuffer(lons, dtype=np.float64)
+    }
+
+class NVEHydrologyAPI(_SessionClient):
     """
     Integration with NVE Hydrology API for water level and flow data
     https://hydapi.nve.no/
     """
     
     BASE_URL = "https://hydapi.nve.no/api/v1"
+    OBSERVATIONS_URL = URL(f"{BASE_URL}/Observations")
+    STATIONS_URL = URL(f"{BASE_URL}/Stations")
+    STATIONS_TTL = 86400  # The station catalog changes rarely; refresh daily
+    # A gauge further away than this does not describe the dam's catchment
+    NEAREST_STATION_MAX_KM = 50.0
     
-    def __init__(self):
-        self.session = None
-    
-    async def _get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
+        self._stations_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._stations_file = CACHE_DIR / 'nve_stations.json'
+        self._stations_lock = asyncio.Lock()
+        # (lat, lon, max_distance_km) -> (looked_up_at, station id)
+        self._nearest_cache: Dict[Tuple[float, float, Optional[float]], Tuple[float, Optional[str]]] = {}
+        # Reused across refreshes so simdjson keeps its internal buffers
+        self._json_parser = simdjson.Parser() if simdjson is not None else None
     
     async def get_water_levels(self, station_id: str, start_date: datetime, end_date: datetime) -> List[WaterLevelData]:
         """Get water level data from NVE station"""
         try:
             session = await self._get_session()
             
-            # Format dates for NVE API
-            start_str = start_date.strftime('%Y-%m-%d')
-            end_str = end_date.strftime('%Y-%m-%d')
-            
-            url = f"{self.BASE_URL}/Observations"
             params = {
                 'StationId': station_id,
                 'Parameter': '1000',  # Water level parameter
                 'ResolutionTime': '60',  # 60 minutes
-                'ReferenceTime': f"{start_str}/{end_str}"
+                'ReferenceTime': f"{start_date.date().isoformat()}/{end_date.date().isoformat()}"
             }
             
-            async with session.get(url, params=params) as response:
+            async with session.get(self.OBSERVATIONS_URL, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     water_data = []
                     
                     for observation in data.get('observations', []):
-                        timestamp = datetime.fromisoformat(observation['time'])
                         value = observation.get('value')
                         
+                        # Only parse timestamps for observations that are kept
                         if value is not None:
                             water_data.append(WaterLevelData(
-                                timestamp=timestamp,
+                                timestamp=_parse_dt(observation['time']),
                                 water_level=float(value),
                                 flow_rate=None,  # Would need separate API call
                                 reservoir_fill=None,  # Calculated separately
@@ -266,90 +550,282 @@ class NVEHydrologyAPI:
                     
                     return water_data
                 else:
-                    logger.error(f"NVE API error: {response.status}")
+                    logger.error("NVE API error: %s", response.status)
                     return []
         except Exception as e:
-            logger.error(f"Error fetching NVE data: {e}")
+            logger.error("Error fetching NVE data: %s", e)
             return []
     
-    async def find_nearest_station(self, lat: float, lon: float) -> Optional[str]:
-        """Find nearest NVE hydrology station"""
+    async def find_nearest_station(self, lat: float, lon: float,
+                                   max_distance_km: Optional[float] = NEAREST_STATION_MAX_KM) -> Optional[str]:
+        """
+        Find the nearest NVE hydrology station within max_distance_km (None searches
+        every station), memoized per location
+        """
+        key = (round(lat, 3), round(lon, 3), max_distance_km)
+        cached = self._nearest_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.STATIONS_TTL:
+            return cached[1]
+        
         try:
-            session = await self._get_session()
-            url = f"{self.BASE_URL}/Stations"
+            catalog = await self._get_station_catalog()
+            if not catalog or not catalog['ids']:
+                return None
             
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Find closest station (simplified)
-                    min_distance = float('inf')
-                    closest_station = None
-                    
-                    for station in data.get('data', []):
-                        if 'latitude' in station and 'longitude' in station:
-                            # Simple distance calculation
-                            distance = ((lat - station['latitude'])**2 + (lon - station['longitude'])**2)**0.5
-                            if distance < min_distance:
-                                min_distance = distance
-                                closest_station = station['stationId']
-                    
-                    return closest_station
+            station_id = self._search_nearest_station(catalog, float(lat), float(lon), max_distance_km)
+            self._nearest_cache[key] = (time.monotonic(), station_id)
+            return station_id
+        except Exception as e:
+            logger.error("Error finding NVE station: %s", e)
+            return None
+    
+    @staticmethod
+    def _search_nearest_station(catalog: Dict[str, Any], lat: float, lon: float,
+                                max_distance_km: Optional[float]) -> Optional[str]:
+        lats, lons = catalog['lats'], catalog['lons']
+        candidates = None
+        if max_distance_km is not None:
+            # Cheap bounding-box compare first so the trig only runs on nearby stations.
+            # Use the cosine at the poleward edge so the box never clips a valid station.
+            dlat_deg = max_distance_km / 111.0
+            dlon_deg = max_distance_km / (111.0 * max(math.cos(math.radians(min(abs(lat) + dlat_deg, 90.0))), 0.01))
+            candidates = np.flatnonzero((np.abs(lats - lat) <= dlat_deg) & (np.abs(lons - lon) <= dlon_deg))
+            if candidates.size == 0:
                 return None
+            lats, lons = lats[candidates], lons[candidates]
+        
+        closest, distance = _nearest_station_idx(lat, lon, lats, lons)
+        if max_distance_km is not None and distance > max_distance_km:
+            return None
+        if candidates is not None:
+            closest = int(candidates[closest])
+        logger.debug("Nearest NVE station %s (%s) at %.1f km", catalog['ids'][closest], catalog['names'][closest], distance)
+        return catalog['ids'][closest]
+    
+    async def _get_station_catalog(self) -> Optional[Dict[str, Any]]:
+        """
+        Station ids with coordinate arrays, served from memory, then from the
+        on-disk cache, and only fetched from NVE once both are older than STATIONS_TTL.
+        Concurrent misses wait on one disk read or download.
+        """
+        catalog = self._cached_station_catalog()
+        if catalog is not None:
+            return catalog
+        
+        async with self._stations_lock:
+            # Another caller may have loaded the catalog while we waited
+            catalog = self._cached_station_catalog()
+            if catalog is not None:
+                return catalog
+            
+            now = time.time()
+            cached = await asyncio.to_thread(self._read_station_file, now)
+            if cached:
+                self._stations_cache = cached
+                return cached[1]
+            
+            catalog = await self._fetch_station_catalog()
+            if catalog is not None:
+                self._stations_cache = (now, catalog)
+                await asyncio.to_thread(self._write_station_file, catalog)
+            return catalog
+    
+    def _cached_station_catalog(self) -> Optional[Dict[str, Any]]:
+        """In-memory catalog while still within STATIONS_TTL"""
+        if self._stations_cache and time.time() - self._stations_cache[0] < self.STATIONS_TTL:
+            return self._stations_cache[1]
+        return None
+    
+    async def _fetch_station_catalog(self) -> Optional[Dict[str, Any]]:
+        """Download the NVE station list and keep only what the distance search needs"""
+        session = await self._get_session()
+        async with session.get(self.STATIONS_URL) as response:
+            if response.status != 200:
+                logger.error("NVE API error: %s", response.status)
+                return None
+            if self._json_parser is None and ijson is not None:
+                return await self._stream_station_catalog(response)
+            body = await response.read()
+        
+        if self._json_parser is not None:
+            return self._parse_station_catalog_lazy(body)
+        data = _json_loads(body)
+        
+        # Columnar layout: coordinate arrays for the distance search plus
+        # parallel id/name lists, so no per-station dicts are kept around
+        stations = data.get('data', [])
+        lats = np.fromiter((station.get('latitude') or np.nan for station in stations),
+                           dtype=np.float64, count=len(stations))
+        lons = np.fromiter((station.get('longitude') or np.nan for station in stations),
+                           dtype=np.float64, count=len(stations))
+        keep = np.flatnonzero(np.isfinite(lats) & np.isfinite(lons))
+        return {
+            'ids': [stations[i]['stationId'] for i in keep],
+            'names': [stations[i].get('stationName') for i in keep],
+            'lats': lats[keep],
+            'lons': lons[keep]
+        }
+    
+    def _parse_station_catalog_lazy(self, body: bytes) -> Dict[str, Any]:
+        """
+        Parse with simdjson and read only the four fields we keep, so the other
+        fields of each station record are never turned into Python objects
+        """
+        ids, names = [], []
+        lats, lons = array('d'), array('d')
+        for station in self._json_parser.parse(body).get('data', []):
+            lat, lon = station.get('latitude'), station.get('longitude')
+            if lat is None or lon is None:
+                continue
+            ids.append(station['stationId'])
+            names.append(station.get('stationName'))
+            lats.append(lat)
+            lons.append(lon)
+        
+        return _columnar_catalog(ids, names, lats, lons)
+    
+    @staticmethod
+    async def _stream_station_catalog(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        """
+        Build the columnar catalog while the body is still downloading, so only
+        one station record is materialized at a time instead of the whole list
+        """
+        ids, names = [], []
+        lats, lons = array('d'), array('d')
+        async for station in ijson.items(response.content, 'data.item', use_float=True):
+            lat, lon = station.get('latitude'), station.get('longitude')
+            if lat is None or lon is None:
+                continue
+            ids.append(station['stationId'])
+            names.append(station.get('stationName'))
+            lats.append(lat)
+            lons.append(lon)
+        
+        return _columnar_catalog(ids, names, lats, lons)
+    
+    def _read_station_file(self, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Load the on-disk catalog if it is still within the TTL"""
+        try:
+            mtime = self._stations_file.stat().st_mtime
+            if now - mtime >= self.STATIONS_TTL:
+                return None
+            raw = _json_loads(self._stations_file.read_bytes())
+            return mtime, {
+                'ids': raw['ids'],
+                'names': raw['names'],
+                'lats': np.asarray(raw['lats'], dtype=np.float64),
+                'lons': np.asarray(raw['lons'], dtype=np.float64)
+            }
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            logger.error(f"Error finding NVE station: {e}")
+            logger.warning("Ignoring unreadable NVE station cache: %s", e)
             return None
     
-    async def close(self):
-        if self.session:
-            await self.session.close()
+    def _write_station_file(self, catalog: Dict[str, Any]):
+        """Persist the catalog atomically so concurrent readers never see a partial file"""
+        try:
+            self._stations_file.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name so two processes refreshing at once never share a file
+            tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self._stations_file.parent,
+                                              prefix='nve_stations.', suffix='.tmp', delete=False)
+            try:
+                with tmp:
+                    tmp.write(_json_dumps(catalog))
+                os.replace(tmp.name, self._stations_file)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+        except Exception as e:
+            logger.warning("Could not write NVE station cache: %s", e)
 
-class SentinelHubAPI:
+class SentinelHubAPI(_SessionClient):
     """
     Integration with Sentinel Hub for satellite imagery and InSAR data
     https://www.sentinel-hub.com/
     """
     
-    def __init__(self, username: str, password: str):
+    AUTH_URL = URL("https://services.sentinel-hub.com/oauth/token")
+    PROCESS_URL = URL("https://services.sentinel-hub.com/api/v1/process")
+    
+    # Constant parts of the Processing API request for a Sentinel-2 true color image
+    BOUNDS_PROPERTIES = {"crs": "http://www.opengis.net/def/crs/EPSG/0/4326"}
+    OUTPUT = {
+        "width": 256,
+        "height": 256,
+        "responses": [{
+            "identifier": "default",
+            "format": {"type": "image/jpeg"}
+        }]
+    }
+    IMAGE_CACHE_SIZE = 1024
+    TRUE_COLOR_EVALSCRIPT = """
+    //VERSION=3
+    function setup() {
+        return {
+            input: ["B02", "B03", "B04", "SCL"],
+            output: { bands: 3 }
+        };
+    }
+    function evaluatePixel(sample) {
+        return [sample.B04, sample.B03, sample.B02];
+    }
+    """
+    
+    def __init__(self, username: str, password: str, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.username = username
         self.password = password
-        self.session = None
         self.auth_token = None
-    
-    async def _get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        # Prebuilt case-insensitive headers; only the bearer token is added per request
+        self._base_headers = CIMultiDict({'Content-Type': 'application/json'})
+        # (lat, lon, day, bbox_size) -> result, least recently used first
+        self._image_cache: OrderedDict[Tuple[float, float, date, float], SatelliteData] = OrderedDict()
+        self._backpressure = BackpressureController()
     
     async def _get_auth_token(self):
-        """Get OAuth token for Sentinel Hub"""
-        if self.auth_token:
+        """Get OAuth token for Sentinel Hub, refreshed shortly before it expires"""
+        if self.auth_token and time.monotonic() < self._token_expires_at:
             return self.auth_token
         
-        try:
-            session = await self._get_session()
-            auth_url = "https://services.sentinel-hub.com/oauth/token"
-            
-            data = {
-                'grant_type': 'client_credentials',
-                'client_id': self.username,
-                'client_secret': self.password
-            }
+        # Concurrent callers wait for a single refresh instead of each posting to OAuth
+        async with self._token_lock:
+            if self.auth_token and time.monotonic() < self._token_expires_at:
+                return self.auth_token
             
-            async with session.post(auth_url, data=data) as response:
-                if response.status == 200:
-                    token_data = await response.json()
-                    self.auth_token = token_data['access_token']
-                    return self.auth_token
-                else:
-                    logger.error(f"Sentinel Hub auth error: {response.status}")
-                    return None
-        except Exception as e:
-            logger.error(f"Error getting Sentinel Hub token: {e}")
-            return None
+            try:
+                session = await self._get_session()
+                
+                data = {
+                    'grant_type': 'client_credentials',
+                    'client_id': self.username,
+                    'client_secret': self.password
+                }
+                
+                async with session.post(self.AUTH_URL, data=data) as response:
+                    if response.status == 200:
+                        token_data = _json_loads(await response.read())
+                        self.auth_token = token_data['access_token']
+                        # Renew 30 s early so in-flight requests never carry an expired token
+                        self._token_expires_at = time.monotonic() + token_data.get('expires_in', 3600) - 30
+                        return self.auth_token
+                    else:
+                        logger.error("Sentinel Hub auth error: %s", response.status)
+                        return None
+            except Exception as e:
+                logger.error("Error getting Sentinel Hub token: %s", e)
+                return None
     
     async def get_satellite_image(self, lat: float, lon: float, date: datetime, bbox_size: float = 0.01) -> Optional[SatelliteData]:
-        """Get satellite imagery for location and date"""
+        """Get satellite imagery for location and date, reusing a result already fetched for that day"""
+        key = (round(lat, 3), round(lon, 3), date.date(), bbox_size)
+        cached = self._image_cache.get(key)
+        if cached is not None:
+            self._image_cache.move_to_end(key)
+            return cached
+        
         try:
             token = await self._get_auth_token()
             if not token:
@@ -357,32 +833,16 @@ class SentinelHubAPI:
             
             session = await self._get_session()
             
-            # Define bounding box around the point
-            bbox = [
-                lon - bbox_size, lat - bbox_size,
-                lon + bbox_size, lat + bbox_size
-            ]
-            
-            # Sentinel Hub Processing API request
-            url = "https://services.sentinel-hub.com/api/v1/process"
+            headers = self._base_headers.copy()
+            headers['Authorization'] = f'Bearer {token}'
             
-            headers = {
-                'Authorization': f'Bearer {token}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Request for Sentinel-2 true color image
+            # Sentinel Hub Processing API request; only the bbox and time range vary per call
             request_data = {
                 "input": {
                     "bounds": {
-                        "properties": {"crs": "http://www.opengis.net/def/crs/EPSG/0/4326"},
-                        "geometry": {
-                            "type": "Polygon",
-                            "coordinates": [[
-                                [bbox[0], bbox[1]], [bbox[2], bbox[1]],
-                                [bbox[2], bbox[3]], [bbox[0], bbox[3]], [bbox[0], bbox[1]]
-                            ]]
-                        }
+                        "properties": self.BOUNDS_PROPERTIES,
+                        # Bounding box around the point; the API takes it directly, no polygon needed
+                        "bbox": [lon - bbox_size, lat - bbox_size, lon + bbox_size, lat + bbox_size]
                     },
                     "data": [{
                         "type": "sentinel-2-l2a",
@@ -395,89 +855,100 @@ class SentinelHubAPI:
                         }
                     }]
                 },
-                "output": {
-                    "width": 256,
-                    "height": 256,
-                    "responses": [{
-                        "identifier": "default",
-                        "format": {"type": "image/jpeg"}
-                    }]
-                },
-                "evalscript": """
-                //VERSION=3
-                function setup() {
-                    return {
-                        input: ["B02", "B03", "B04", "SCL"],
-                        output: { bands: 3 }
-                    };
-                }
-                function evaluatePixel(sample) {
-                    return [sample.B04, sample.B03, sample.B02];
-                }
-                """
+                "output": self.OUTPUT,
+                "evalscript": self.TRUE_COLOR_EVALSCRIPT
             }
             
-            async with session.post(url, headers=headers, json=request_data) as response:
-                if response.status == 200:
-                    # For now, return metadata (actual image would be binary data)
-                    return SatelliteData(
-                        timestamp=date,
-                        satellite="Sentinel-2",
-                        observation_type="optical",
-                        cloud_cover=None,  # Would be extracted from metadata
-                        image_quality=0.8,  # Placeholder
-                        displacement=None,  # Not available for optical
-                        vegetation_index=None,  # Could be calculated
-                        water_surface_area=None,  # Could be calculated
-                        image_url=f"sentinel_hub_image_{date.strftime('%Y%m%d')}.jpg"
-                    )
-                else:
-                    logger.error(f"Sentinel Hub API error: {response.status}")
-                    return None
+            async with self._backpressure:
+                async with session.post(self.PROCESS_URL, headers=headers, data=_json_dumps(request_data)) as response:
+                    self._backpressure.record(response.status, response.headers.get('Retry-After'))
+                    if response.status == 200:
+                        # The JPEG itself is not used yet. Drain it in small chunks instead of
+                        # buffering it whole; a fully read body lets the connection go back to
+                        # the pool, whereas an unread one would be closed on release
+                        async for _ in response.content.iter_chunked(64 * 1024):
+                            pass
+                        
+                        # For now, return metadata (actual image would be binary data)
+                        satellite = SatelliteData(
+                            timestamp=date,
+                            satellite="Sentinel-2",
+                            observation_type="optical",
+                            cloud_cover=None,  # Would be extracted from metadata
+                            image_quality=0.8,  # Placeholder
+                            displacement=None,  # Not available for optical
+                            vegetation_index=None,  # Could be calculated
+                            water_surface_area=None,  # Could be calculated
+                            image_url=f"sentinel_hub_image_{date.strftime('%Y%m%d')}.jpg"
+                        )
+                        
+                        # Processing units are billed per request, so keep the day's result
+                        self._image_cache[key] = satellite
+                        if len(self._image_cache) > self.IMAGE_CACHE_SIZE:
+                            self._image_cache.popitem(last=False)
+                        return satellite
+                    else:
+                        logger.error("Sentinel Hub API error: %s", response.status)
+                        return None
         except Exception as e:
-            logger.error(f"Error fetching Sentinel Hub data: {e}")
+            logger.error("Error fetching Sentinel Hub data: %s", e)
             return None
-    
-    async def close(self):
-        if self.session:
-            await self.session.close()
 
-class VARSOMAPI:
+class VARSOMAPI(_SessionClient):
     """
     Integration with VARSOM (Norwegian avalanche and flood warning service)
     https://api.varsom.no/
     """
     
     BASE_URL = "https://api.varsom.no/v2"
+    FLOOD_WARNINGS_URL = URL(f"{BASE_URL}/warnings/flood")
+    WARNINGS_TTL = 300  # seconds; warnings are identical for every dam in a region
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
+        self._warnings_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._warnings_locks: Dict[str, asyncio.Lock] = {}
     
-    async def _get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    def _cached_warnings(self, region_id: str) -> Optional[List[Dict]]:
+        cached = self._warnings_cache.get(region_id)
+        if cached and time.monotonic() - cached[0] < self.WARNINGS_TTL:
+            return cached[1]
+        return None
     
     async def get_flood_warnings(self, region_id: str) -> List[Dict]:
-        """Get flood warnings for a region"""
+        """
+        Get flood warnings for a region, cached for WARNINGS_TTL seconds.
+        Concurrent misses for the same region wait on one in-flight request.
+        """
+        warnings = self._cached_warnings(region_id)
+        if warnings is not None:
+            return warnings
+        
+        async with self._warnings_locks.setdefault(region_id, asyncio.Lock()):
+            # Another caller may have refreshed the region while we waited
+            warnings = self._cached_warnings(region_id)
+            if warnings is not None:
+                return warnings
+            
+            warnings = await self._fetch_flood_warnings(region_id)
+            if warnings is None:
+                return []
+            self._warnings_cache[region_id] = (time.monotonic(), warnings)
+            return warnings
+    
+    async def _fetch_flood_warnings(self, region_id: str) -> Optional[List[Dict]]:
         try:
             session = await self._get_session()
-            url = f"{self.BASE_URL}/warnings/flood/{region_id}"
-            
-            async with session.get(url) as response:
+            async with session.get(self.FLOOD_WARNINGS_URL / region_id) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     return data.get('warnings', [])
                 else:
-                    logger.error(f"VARSOM API error: {response.status}")
-                    return []
+                    logger.error("VARSOM API error: %s", response.status)
+                    return None
         except Exception as e:
-            logger.error(f"Error fetching VARSOM data: {e}")
-            return []
-    
-    async def close(self):
-        if self.session:
-            await self.session.close()
+            logger.error("Error fetching VARSOM data: %s", e)
+            return None
 
 class HealthMonitoringAPI:
     """
@@ -486,32 +957,39 @@ class HealthMonitoringAPI:
     """
     
     def __init__(self, frost_client_id: str, sentinel_user: str, sentinel_pass: str):
-        self.met_no = MetNoAPI()
-        self.frost = FrostAPI(frost_client_id)
-        self.nve = NVEHydrologyAPI()
-        self.sentinel = SentinelHubAPI(sentinel_user, sentinel_pass)
-        self.varsom = VARSOMAPI()
-    
-    async def collect_dam_data(self, dam_id: int, lat: float, lon: float) -> Dict[str, Any]:
-        """Collect all available data for a specific dam"""
-        logger.info(f"Collecting data for dam {dam_id} at ({lat}, {lon})")
-        
-        tasks = []
-        
-        # Current weather from met.no
-        tasks.append(self._safe_task(self.met_no.get_current_weather(lat, lon), "met_no"))
-        
-        # Find and get historical weather from Frost
-        tasks.append(self._safe_task(self._get_frost_data(lat, lon), "frost"))
+        # One connection pool for every source; per-API auth and headers go on each request
+        self.session = _create_session()
+        self.met_no = MetNoAPI(self.session)
+        self.frost = FrostAPI(frost_client_id, self.session)
+        self.nve = NVEHydrologyAPI(self.session)
+        self.sentinel = SentinelHubAPI(sentinel_user, sentinel_pass, self.session)
+        self.varsom = VARSOMAPI(self.session)
+    
+    async def collect_dam_data(self, dam_id: int, lat: float, lon: float,
+                               frost_history: Optional[Awaitable[Optional[List[WeatherData]]]] = None) -> Dict[str, Any]:
+        """
+        Collect all available data for a specific dam; frost_history, when given, is
+        awaited instead of querying Frost for this dam alone
+        """
+        logger.info("Collecting data for dam %s at (%s, %s)", dam_id, lat, lon)
         
-        # Find and get water level data from NVE
-        tasks.append(self._safe_task(self._get_nve_data(lat, lon), "nve"))
+        sources = ('met_no', 'frost', 'nve', 'sentinel')
         
-        # Get recent satellite imagery
-        tasks.append(self._safe_task(self.sentinel.get_satellite_image(lat, lon, datetime.now()), "sentinel"))
+        # Collect all data concurrently: current weather from met.no, historical weather
+        # from Frost, water levels from NVE and recent satellite imagery
+        results = await asyncio.gather(
+            self.met_no.get_current_weather(lat, lon),
+            self._get_frost_data(lat, lon) if frost_history is None else frost_history,
+            self._get_nve_data(lat, lon),
+            self.sentinel.get_satellite_image(lat, lon, datetime.now()),
+            return_exceptions=True
+        )
         
-        # Collect all data concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # A failed source is logged and reported as missing
+        for i, (source, result) in enumerate(zip(sources, results)):
+            if isinstance(result, Exception):
+                logger.error("Error in %s: %s", source, result)
+                results[i] = None
         
         # Package results
         data = {
@@ -526,13 +1004,61 @@ class HealthMonitoringAPI:
         
         return data
     
-    async def _safe_task(self, coro, source_name):
-        """Execute a task safely with error handling"""
+    async def collect_many(self, dams: List[Tuple[int, float, float]], db_pool=None,
+                           max_concurrent: int = 16) -> List[Dict[str, Any]]:
+        """
+        Collect data for many (dam_id, lat, lon) tuples with at most max_concurrent
+        dams in flight, storing each one as soon as it arrives when db_pool is given.
+        Per-API request limits are enforced by the shared connector. Returns the data
+        of the dams that were collected and, when db_pool is given, actually stored.
+        """
+        if not dams:
+            return []
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        # Neighbouring dams usually share a Frost station: each station's history is
+        # fetched once and every dam waits only for its own station, never for the batch
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=7)  # Last week
+        station_tasks: Dict[str, asyncio.Task] = {}
+        
+        async def frost_history(lat: float, lon: float) -> Optional[List[WeatherData]]:
+            station_id = await self.frost.find_nearest_station(lat, lon)
+            if not station_id:
+                return None
+            task = station_tasks.get(station_id)
+            if task is None:
+                task = station_tasks[station_id] = asyncio.create_task(
+                    self.frost.get_historical_weather(station_id, start_date, end_date)
+                )
+            # Shielded so one cancelled dam does not cancel the fetch its neighbours share
+            return await asyncio.shield(task)
+        
+        # Started outside the semaphore, so a slot is only held for the dam's own work
+        frost_tasks = {dam_id: asyncio.create_task(frost_history(lat, lon)) for dam_id, lat, lon in dams}
+        
+        async def collect(dam_id: int, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                data = await self.collect_dam_data(dam_id, lat, lon, frost_history=frost_tasks[dam_id])
+                if db_pool is not None and not await self.store_data(data, db_pool):
+                    return None
+                return data
+        
         try:
-            return await coro
-        except Exception as e:
-            logger.error(f"Error in {source_name}: {e}")
-            return None
+            results = await asyncio.gather(*(collect(*dam) for dam in dams), return_exceptions=True)
+        finally:
+            # Don't leave Frost requests running if the batch is cancelled
+            for task in (*frost_tasks.values(), *station_tasks.values()):
+                task.cancel()
+        
+        collected = []
+        for (dam_id, _, _), result in zip(dams, results):
+            if isinstance(result, Exception):
+                logger.error("Error collecting data for dam %s: %s", dam_id, result)
+            elif result is not None:
+                collected.append(result)
+        return collected
     
     async def _get_frost_data(self, lat: float, lon: float):
         """Get historical weather data from Frost API"""
@@ -552,39 +1078,50 @@ class HealthMonitoringAPI:
             return await self.nve.get_water_levels(station_id, start_date, end_date)
         return None
     
-    async def store_data(self, data: Dict[str, Any], db_pool):
-        """Store collected data in TimescaleDB"""
+    async def store_data(self, data: Dict[str, Any], db_pool) -> bool:
+        """Store collected data in TimescaleDB; returns False if the write failed"""
         try:
             async with db_pool.acquire() as conn:
-                # Store weather data
+                # Store current and historical weather in one batch
+                weather = []
                 if data.get('weather_current'):
-                    await self._store_weather_data(conn, data['dam_id'], data['weather_current'])
-                
-                # Store historical weather
+                    weather.append(data['weather_current'])
                 if data.get('weather_historical'):
-                    for weather in data['weather_historical']:
-                        await self._store_weather_data(conn, data['dam_id'], weather)
+                    weather.extend(data['weather_historical'])
+                if weather:
+                    await self._store_weather_data(conn, data['dam_id'], weather)
                 
                 # Store water levels
                 if data.get('water_levels'):
-                    for water in data['water_levels']:
-                        await self._store_water_data(conn, data['dam_id'], water)
+                    await self._store_water_data(conn, data['dam_id'], data['water_levels'])
                 
                 # Store satellite data
                 if data.get('satellite_data'):
                     await self._store_satellite_data(conn, data['dam_id'], data['satellite_data'])
                 
-                logger.info(f"Successfully stored data for dam {data['dam_id']}")
+                logger.info("Successfully stored data for dam %s", data['dam_id'])
+                return True
         except Exception as e:
-            logger.error(f"Error storing data: {e}")
+            logger.error("Error storing data for dam %s: %s", data.get('dam_id'), e)
+            return False
     
-    async def _store_weather_data(self, conn, dam_id: int, weather: WeatherData):
-        """Store weather data in database"""
+    async def _store_weather_data(self, conn, dam_id: int, weather: List[WeatherData]):
+        """
+        Store weather data in database as one INSERT ... SELECT FROM unnest(),
+        sending each column as a single array
+        """
+        # One upsert statement may not touch a row twice; later rows win, as they did per-row
+        weather = list({w.timestamp: w for w in weather}.values())
         await conn.execute("""
             INSERT INTO weather_data (time, dam_id, temperature_c, precipitation_mm, 
                                     wind_speed_ms, wind_direction, humidity_percent, 
                                     pressure_hpa, snow_depth_cm, data_source)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            SELECT time, $2, temperature_c, precipitation_mm, wind_speed_ms, wind_direction,
+                   humidity_percent, pressure_hpa, snow_depth_cm, data_source
+            FROM unnest($1::timestamptz[], $3::float8[], $4::float8[], $5::float8[], $6::float8[],
+                        $7::float8[], $8::float8[], $9::float8[], $10::text[])
+                AS w(time, temperature_c, precipitation_mm, wind_speed_ms, wind_direction,
+                     humidity_percent, pressure_hpa, snow_depth_cm, data_source)
             ON CONFLICT (time, dam_id) DO UPDATE SET
                 temperature_c = EXCLUDED.temperature_c,
                 precipitation_mm = EXCLUDED.precipitation_mm,
@@ -594,24 +1131,34 @@ class HealthMonitoringAPI:
                 pressure_hpa = EXCLUDED.pressure_hpa,
                 snow_depth_cm = EXCLUDED.snow_depth_cm,
                 data_source = EXCLUDED.data_source
-        """, weather.timestamp, dam_id, weather.temperature, weather.precipitation,
-             weather.wind_speed, weather.wind_direction, weather.humidity,
-             weather.pressure, weather.snow_depth, weather.source)
+        """, [w.timestamp for w in weather], dam_id,
+             [w.temperature for w in weather], [w.precipitation for w in weather],
+             [w.wind_speed for w in weather], [w.wind_direction for w in weather],
+             [w.humidity for w in weather], [w.pressure for w in weather],
+             [w.snow_depth for w in weather], [w.source for w in weather])
     
-    async def _store_water_data(self, conn, dam_id: int, water: WaterLevelData):
-        """Store water level data in database"""
+    async def _store_water_data(self, conn, dam_id: int, water_levels: List[WaterLevelData]):
+        """
+        Store water level data in database as one INSERT ... SELECT FROM unnest(),
+        sending each column as a single array
+        """
+        water_levels = list({water.timestamp: water for water in water_levels}.values())
         await conn.execute("""
             INSERT INTO water_levels (time, dam_id, water_level_m, flow_rate_m3s, 
                                     reservoir_fill_percent, inflow_m3s, outflow_m3s)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            SELECT time, $2, water_level_m, flow_rate_m3s, reservoir_fill_percent, inflow_m3s, outflow_m3s
+            FROM unnest($1::timestamptz[], $3::float8[], $4::float8[], $5::float8[], $6::float8[], $7::float8[])
+                AS w(time, water_level_m, flow_rate_m3s, reservoir_fill_percent, inflow_m3s, outflow_m3s)
             ON CONFLICT (time, dam_id) DO UPDATE SET
                 water_level_m = EXCLUDED.water_level_m,
                 flow_rate_m3s = EXCLUDED.flow_rate_m3s,
                 reservoir_fill_percent = EXCLUDED.reservoir_fill_percent,
                 inflow_m3s = EXCLUDED.inflow_m3s,
                 outflow_m3s = EXCLUDED.outflow_m3s
-        """, water.timestamp, dam_id, water.water_level, water.flow_rate,
-             water.reservoir_fill, water.inflow, water.outflow)
+        """, [water.timestamp for water in water_levels], dam_id,
+             [water.water_level for water in water_levels], [water.flow_rate for water in water_levels],
+             [water.reservoir_fill for water in water_levels], [water.inflow for water in water_levels],
+             [water.outflow for water in water_levels])
     
     async def _store_satellite_data(self, conn, dam_id: int, satellite: SatelliteData):
         """Store satellite data in database"""
@@ -640,6 +1187,7 @@ class HealthMonitoringAPI:
         await self.nve.close()
         await self.sentinel.close()
         await self.varsom.close()
+        await self.session.close()
 
 # Example usage and testing
 async def test_apis():
@@ -660,25 +1208,36 @@ async def test_apis():
     lat, lon = 59.9139, 10.7522
     
     try:
-        # Test individual APIs
-        logger.info("Testing met.no API...")
-        weather = await monitoring.met_no.get_current_weather(lat, lon)
-        logger.info(f"Weather data: {weather}")
+        # Probe the independent APIs concurrently; one failure should not hide the others
+        probes = [
+            ('met.no', monitoring.met_no.get_current_weather(lat, lon)),
+            ('Frost', monitoring.frost.find_nearest_station(lat, lon)),
+            ('NVE', monitoring.nve.find_nearest_station(lat, lon)),
+            ('Sentinel Hub', monitoring.sentinel.get_satellite_image(lat, lon, datetime.now()))
+        ]
+        logger.info("Testing %s APIs...", ', '.join(name for name, _ in probes))
+        outcomes = await asyncio.gather(*(probe for _, probe in probes), return_exceptions=True)
         
-        logger.info("Testing Frost API...")
-        station = await monitoring.frost.find_nearest_station(lat, lon)
-        logger.info(f"Nearest station: {station}")
-        
-        logger.info("Testing NVE API...")
-        nve_station = await monitoring.nve.find_nearest_station(lat, lon)
-        logger.info(f"Nearest NVE station: {nve_station}")
-        
-        logger.info("Testing Sentinel Hub...")
-        satellite = await monitoring.sentinel.get_satellite_image(lat, lon, datetime.now())
-        logger.info(f"Satellite data: {satellite}")
+        # One summary record instead of a log call per probe. The clients log and
+        # swallow their own errors, returning None/[], so an empty result is a failure too
+        working = [not isinstance(outcome, Exception) and bool(outcome) for outcome in outcomes]
+        summary = "\n".join(
+            f"  {name:<12}: {'ok: ' if ok else 'failed: '}{outcome}"
+            for (name, _), outcome, ok in zip(probes, outcomes, working)
+        )
+        logger.log(logging.INFO if all(working) else logging.ERROR,
+                   "API probe results (%d/%d working):\n%s", sum(working), len(probes), summary)
         
     finally:
         await monitoring.close_all()
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; only the standalone run sets the policy,
+    # importing this module never changes the host application's event loop
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     asyncio.run(test_apis()) 
\ No newline at end of file
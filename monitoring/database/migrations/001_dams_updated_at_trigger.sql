@@ -0,0 +1,25 @@
+-- =====================================================================================
+-- MIGRATION 001 - maintain dams.updated_at on UPDATE
+-- =====================================================================================
+-- schema.sql only runs when the database volume is first initialised; apply this to
+-- existing deployments so the /dams ETag changes whenever a dam row changes:
+--
+--   docker compose exec -T timescaledb psql -U postgres -d postgres \
+--       < database/migrations/001_dams_updated_at_trigger.sql
+-- =====================================================================================
+
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dams_touch_updated_at ON dams;
+CREATE TRIGGER trg_dams_touch_updated_at
+    BEFORE UPDATE ON dams
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+-- Rows may have changed before the trigger existed; move the version forward once
+UPDATE dams SET updated_at = NOW();
@@ -394,6 +394,20 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Keep dams.updated_at current on every UPDATE; the API derives the /dams ETag from it
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dams_touch_updated_at ON dams;
+CREATE TRIGGER trg_dams_touch_updated_at
+    BEFORE UPDATE ON dams
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
 -- =====================================================================================
 -- INDEXES FOR PERFORMANCE
 -- =====================================================================================